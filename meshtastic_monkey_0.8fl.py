@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
+import asyncio
 import threading
 import time
-import queue
+import re
+import collections
+import bisect
+import heapq
 from datetime import datetime
 from meshtastic.serial_interface import SerialInterface
 from pubsub import pub
@@ -10,27 +14,81 @@ from prompt_toolkit.patch_stdout import patch_stdout
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.history import FileHistory
 import os
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 C_BLUE = "\033[94m"
 C_GREEN = "\033[32m"
 C_RED = "\033[91m"
 C_RESET = "\033[0m"
 
+# Шаблоны строк лога: цвета и постоянный текст подставляются один раз при импорте
+_FMT_PUB = f"{C_GREEN}[%s] PUB %s: %s{C_RESET}"
+_FMT_PM = f"{C_RED}[%s] PM %s: %s{C_RESET}"
+_FMT_META = f"{C_BLUE}%s{C_RESET}"
+_FMT_ACK = f"{C_BLUE}[%s] ACK from %s, %s{C_RESET}"
+_FMT_NO_ACK = f"{C_BLUE}[%s] NO ACK from %s, id=%s{C_RESET}"
+_FMT_ACK_OVERFLOW = f"{C_BLUE}[%s] WARN pending_acks overflow, dropping oldest{C_RESET}"
+_FMT_QUEUE_FULL = f"{C_BLUE}[%s] Send queue full, dropping %s{C_RESET}"
+_FMT_UNKNOWN_NODE = f"{C_BLUE}[%s] Unknown node: %s{C_RESET}"
+
 ACK_TIMEOUT = 30
 MAX_PENDING_ACKS = 100
 SEND_DELAY = 1.5  # Задержка между отправками для избежания сбоев в доставке
+MAX_TEXT_BYTES = 200  # Предел длины склеенного автоответа
 
-stop_event = threading.Event()
-pending_acks = {}
-pending_lock = threading.Lock()
-name_cache = {}
+# pending_acks и _expiry_heap трогаются только из цикла asyncio, блокировка не нужна
+pending_acks = collections.OrderedDict()
+_expiry_heap = []  # (deadline, packet_id, dest_id, sent_at)
+name_cache = {}  # node_id -> (имя, "@!xxxxxxxx", "имя (@!xxxxxxxx)")
 name_cache_lock = threading.Lock()
-send_queue = queue.Queue(maxsize=30)
+_sorted_names = []  # отсортированные shortName для автодополнения, под name_cache_lock
+_node_short = {}
+_shortname_index = {}  # shortName -> node_id, под name_cache_lock
+# Создаются в amain() внутри запущенного цикла
+_loop = None
+send_queue = None
+_expiry_wake = None
+
+_MARKERS = ("testa", "test", "тест", "ping")  # список маркеров
+_MARKER_RE = re.compile(r"\b(?:" + "|".join(re.escape(m) for m in _MARKERS) + r")\b", re.IGNORECASE)
+_marker_search = _MARKER_RE.search  # связанный метод, чтобы не искать атрибут на каждый пакет
+_MARKER_AC = None
+_marker_iter = None
+if ahocorasick is not None:
+    _MARKER_AC = ahocorasick.Automaton()
+    for _m in _MARKERS:
+        _MARKER_AC.add_word(_m.lower(), len(_m))
+    _MARKER_AC.make_automaton()
+    _marker_iter = _MARKER_AC.iter
+
+def _is_word_char(c):
+    return c.isalnum() or c == "_"
+
+def has_marker(text):
+    # Без pyahocorasick используется скомпилированный regex
+    if _marker_iter is None:
+        return _marker_search(text) is not None
+    lower = text.lower()
+    n = len(lower)
+    for end, length in _marker_iter(lower):
+        start = end - length + 1
+        if start > 0 and _is_word_char(lower[start - 1]):
+            continue
+        if end + 1 < n and _is_word_char(lower[end + 1]):
+            continue
+        return True
+    return False
 
 def ts():
     return datetime.now().strftime("%m-%d %H:%M")
 
 def normalize_node_id(raw_id):
+    # В пакетах Meshtastic id обычно уже int, поэтому эта проверка первая
+    if type(raw_id) is int:
+        return raw_id
     if isinstance(raw_id, str) and raw_id.startswith("!"):
         try:
             return int(raw_id[1:], 16)
@@ -40,35 +98,28 @@ def normalize_node_id(raw_id):
         return raw_id
     return None
 
+def get_node_names(interface, node_id):
+    with name_cache_lock:
+        entry = name_cache.get(node_id)
+    if entry is None:
+        # Чтение interface.nodes без блокировки: под GIL dict.get атомарен
+        hex_key = f"!{node_id:08x}"
+        short = interface.nodes.get(node_id, {}).get("user", {}).get("shortName")
+        if not short:
+            node_by_hex = interface.nodes.get(hex_key)
+            if node_by_hex:
+                short = node_by_hex.get("user", {}).get("shortName")
+        name = short or hex_key
+        entry = (name, f"@{hex_key}", f"{name} (@{hex_key})")
+        with name_cache_lock:
+            entry = name_cache.setdefault(node_id, entry)
+    return entry
+
 def get_name_and_id(interface, node_id):
     if node_id is None or not isinstance(node_id, int):
         return "unknown", "@unknown"
-    with name_cache_lock:
-        if node_id not in name_cache:
-            node = interface.nodes.get(node_id, {})
-            user = node.get("user", {})
-            short = user.get("shortName")
-            if short:
-                name_cache[node_id] = short
-                display = f"{short} (@!{node_id:08x})"
-            else:
-                hex_key = f"!{node_id:08x}"
-                node_by_hex = interface.nodes.get(hex_key)
-                if node_by_hex:
-                    short = node_by_hex.get("user", {}).get("shortName")
-                    if short:
-                        name_cache[node_id] = short
-                        display = f"{short} (@{hex_key})"
-                    else:
-                        name_cache[node_id] = hex_key
-                        display = f"{hex_key} (@!{node_id:08x})"
-                else:
-                    name_cache[node_id] = hex_key
-                    display = f"{hex_key} (@!{node_id:08x})"
-        else:
-            name = name_cache[node_id]
-            display = f"{name} (@!{node_id:08x})"
-    return name_cache.get(node_id, "unknown"), display
+    name, _, display = get_node_names(interface, node_id)
+    return name, display
 
 def resolve_node(interface, token):
     if token.startswith("!"):
@@ -76,96 +127,168 @@ def resolve_node(interface, token):
             return int(token[1:], 16)
         except ValueError:
             return None
-    nodes_snapshot = list(interface.nodes.items())
-    for nid, node in nodes_snapshot:
-        user = node.get("user", {})
-        if user.get("shortName") == token:
-            if isinstance(nid, int):
-                return nid
-            if isinstance(nid, str) and nid.startswith("!"):
-                try:
-                    return int(nid[1:], 16)
-                except ValueError:
-                    pass
-    return None
+    return _shortname_index.get(token)
+
+def index_node(node):
+    nid = node.get("num")
+    if nid is None:
+        return
+    short = node.get("user", {}).get("shortName")
+    with name_cache_lock:
+        old = _node_short.get(nid)
+        if old == short:
+            return
+        if short:
+            _node_short[nid] = short
+        else:
+            _node_short.pop(nid, None)
+        if old and _shortname_index.get(old) == nid:
+            other = next((n for n, name in _node_short.items() if name == old), None)
+            if other is not None:
+                _shortname_index[old] = other
+            else:
+                del _shortname_index[old]
+                i = bisect.bisect_left(_sorted_names, old)
+                if i < len(_sorted_names) and _sorted_names[i] == old:
+                    del _sorted_names[i]
+        if short and short not in _shortname_index:
+            _shortname_index[short] = nid
+            bisect.insort(_sorted_names, short)
 
 def on_node_updated(node):
     nid = node.get("num")
     if nid is not None:
         with name_cache_lock:
             name_cache.pop(nid, None)
+        index_node(node)
+
+class SendQueue(asyncio.Queue):
+    # asyncio.Queue с просмотром головы без извлечения (для склейки автоответов)
+    def peek_nowait(self):
+        if self.empty():
+            raise asyncio.QueueEmpty
+        return self._queue[0]
+
+def merge_auto_replies(text, dest_id):
+    # Забирает из очереди подряд идущие автоответы (wantAck=False) тому же адресату,
+    # пока склеенный текст помещается в MAX_TEXT_BYTES; остальное остаётся в очереди
+    while True:
+        try:
+            next_text, next_dest, next_ack = send_queue.peek_nowait()
+        except asyncio.QueueEmpty:
+            return text
+        joined = f"{text}\n{next_text}"
+        if next_ack or next_dest != dest_id or len(joined.encode('utf-8')) > MAX_TEXT_BYTES:
+            return text
+        send_queue.get_nowait()
+        text = joined
 
-def sender_thread(interface, stop_event, send_queue, pending_acks, pending_lock):
-    while not stop_event.is_set():
+async def sender_task(interface):
+    while True:
         try:
-            task = send_queue.get(timeout=1)
-            if stop_event.is_set():
-                break
-            text, dest_id, want_ack = task
+            text, dest_id, want_ack = await send_queue.get()
+            if not want_ack:
+                text = merge_auto_replies(text, dest_id)
             try:
+                # sendText пишет в последовательный порт и может блокироваться
                 if dest_id is not None:
-                    pkt = interface.sendText(text, destinationId=dest_id, wantAck=want_ack)
+                    pkt = await asyncio.to_thread(interface.sendText, text, destinationId=dest_id, wantAck=want_ack)
                 else:
-                    pkt = interface.sendText(text, wantAck=want_ack)
-                if want_ack and pkt and hasattr(pkt, 'id'):
-                    with pending_lock:
-                        if len(pending_acks) >= MAX_PENDING_ACKS:
-                            oldest = next(iter(pending_acks))
-                            pending_acks.pop(oldest, None)
-                            with patch_stdout(raw=True):
-                                print(f"{C_BLUE}[{ts()}] WARN pending_acks overflow, dropping oldest{C_RESET}")
-                        pending_acks[pkt.id] = (time.time(), dest_id)
-                time.sleep(SEND_DELAY)  # Задержка для стабильной доставки
+                    pkt = await asyncio.to_thread(interface.sendText, text, wantAck=want_ack)
+                pid = getattr(pkt, 'id', None)
+                if want_ack and pid is not None:
+                    if len(pending_acks) >= MAX_PENDING_ACKS:
+                        pending_acks.popitem(last=False)
+                        print(_FMT_ACK_OVERFLOW % ts())
+                    sent_at = time.time()
+                    pending_acks[pid] = (sent_at, dest_id)
+                    pending_acks.move_to_end(pid)
+                    heapq.heappush(_expiry_heap, (sent_at + ACK_TIMEOUT, pid, dest_id, sent_at))
+                    _expiry_wake.set()
+                await asyncio.sleep(SEND_DELAY)  # Задержка для стабильной доставки
             except Exception as send_e:
-                with patch_stdout(raw=True):
-                    print(f"TX error: {send_e}")
-        except queue.Empty:
-            continue
+                print(f"TX error: {send_e}")
         except Exception as e:
-            with patch_stdout(raw=True):
-                print(f"Sender thread error: {e}")
+            print(f"Sender task error: {e}")
+
+async def ack_watcher():
+    # Спит до ближайшего дедлайна; при пустой куче ждёт сигнала от sender_task
+    while True:
+        wait_for = _expiry_heap[0][0] - time.time() if _expiry_heap else None
+        if wait_for is None or wait_for > 0:
+            try:
+                await asyncio.wait_for(_expiry_wake.wait(), wait_for)
+            except asyncio.TimeoutError:
+                pass
+            _expiry_wake.clear()
+        now = time.time()
+        while _expiry_heap and _expiry_heap[0][0] <= now:
+            _, rid, dest, sent_at = heapq.heappop(_expiry_heap)
+            entry = pending_acks.get(rid)
+            # ACK уже получен или запись вытеснена/перезаписана
+            if entry is None or entry[0] != sent_at:
+                continue
+            del pending_acks[rid]
+            dst = f"@!{dest:08x}" if dest else "@broadcast"
+            print(_FMT_NO_ACK % (ts(), dst, rid))
 
 def on_receive(packet, interface):
+    # Вызывается из потока meshtastic: обработка переносится в цикл asyncio
+    decoded = packet.get("decoded", {})
+    if decoded.get("portnum") == "NODEINFO_APP":
+        # meshtastic.node.updated публикуется только при начальной загрузке, поэтому
+        # узлы, услышанные позже, индексируются здесь же (on_node_updated потокобезопасен)
+        try:
+            from_id = normalize_node_id(packet.get("fromId") or packet.get("from"))
+            if from_id is not None:
+                on_node_updated({"num": from_id, "user": decoded.get("user", {})})
+        except Exception as e:
+            print(f"RX error: {e}")
+        return
+    loop = _loop
+    if loop is None:
+        return
+    try:
+        loop.call_soon_threadsafe(handle_packet, packet, interface)
+    except RuntimeError:
+        pass  # цикл уже закрыт
+
+def handle_packet(packet, interface):
     try:
         decoded = packet.get("decoded", {})
         port = decoded.get("portnum")
+        if port != "ROUTING_APP" and port != "TEXT_MESSAGE_APP":
+            return
+        from_id = normalize_node_id(packet.get("fromId") or packet.get("from"))
+        to_id = normalize_node_id(packet.get("to"))
         if port == "ROUTING_APP":
             req_id = decoded.get("requestId")
             if req_id is None:
                 return
-            with pending_lock:
-                entry = pending_acks.pop(req_id, None)
+            entry = pending_acks.pop(req_id, None)
             if entry:
                 sent_at, _ = entry
                 rtt = time.time() - sent_at
-                from_id = normalize_node_id(packet.get("fromId") or packet.get("from"))
                 _, display = get_name_and_id(interface, from_id) if from_id else ("?", "unknown")
-                rssi = packet.get("rxRssi")
-                snr = packet.get("rxSnr")
+                rssi, snr = packet.get("rxRssi"), packet.get("rxSnr")
                 params = [f"RTT={rtt:.1f}s"]
                 if rssi is not None:
                     params.append(f"RSSI={rssi}")
                 if snr is not None:
                     params.append(f"SNR={snr}")
-                with patch_stdout(raw=True):
-                    print(f"{C_BLUE}[{ts()}] ACK from {display}, " + ", ".join(params) + f"{C_RESET}")
-            return
-        if port != "TEXT_MESSAGE_APP":
+                print(_FMT_ACK % (ts(), display, ", ".join(params)))
             return
         text = decoded.get("payload", b"").decode(errors="ignore").strip()
-        from_id = normalize_node_id(packet.get("fromId") or packet.get("from"))
-        name, _ = get_name_and_id(interface, from_id) if from_id else ("unknown", "")
-        display_id = f"@!{from_id:08x}" if from_id else "@??"
+        now_ts = ts()  # "02-06 16:43"
+        name, display_id, _ = get_node_names(interface, from_id) if from_id else ("unknown", "@??", "")
         try:
             my_id = interface.myInfo.my_node_num
         except AttributeError:
             my_id = None
-        to_id = normalize_node_id(packet.get("to"))
         is_private = to_id not in (None, 0xFFFFFFFF) and to_id == my_id
-        rssi = packet.get("rxRssi")
-        snr = packet.get("rxSnr")
-        hop_start = packet.get("hopStart")
-        hop_limit = packet.get("hopLimit")
+        rssi, snr, hop_start, hop_limit = (
+            packet.get("rxRssi"), packet.get("rxSnr"), packet.get("hopStart"), packet.get("hopLimit")
+        )
         params = []
         if rssi is not None:
             params.append(f"RSSI={rssi}")
@@ -174,71 +297,97 @@ def on_receive(packet, interface):
         if hop_start and hop_limit:
             params.append(f"hops={hop_start - hop_limit}")
         meta = f"({display_id}, {', '.join(params)})" if params else f"({display_id})"
-        with patch_stdout(raw=True):
-            if is_private:
-                print(f"{C_RED}[{ts()}] PM {name}: {text}{C_RESET}")
-            else:
-                print(f"{C_GREEN}[{ts()}] PUB {name}: {text}{C_RESET}")
-            print(f"{C_BLUE}{meta}{C_RESET}")
-        import re
-        markers = ["testa", "test", "тест", "ping"]  # список маркеров
-        pattern = r"\b(?:" + "|".join(re.escape(marker) for marker in markers) + r")\b"
-        if re.search(pattern, text, re.IGNORECASE):
-            ts_full = ts()              # "02-06 16:43"
-            ts_str = ts_full.split()[1]  # "16:43"
+        if is_private:
+            print(_FMT_PM % (now_ts, name, text))
+        else:
+            print(_FMT_PUB % (now_ts, name, text))
+        print(_FMT_META % meta)
+        if has_marker(text):
+            ts_str = now_ts.split()[1]  # "16:43"
             tech_data = ', '.join(params)
             reply_text = f"✅ AR-ACK [{ts_str}] {name} ({display_id}, 📶{tech_data})"
             dest_id = from_id if is_private else None
             try:
                 send_queue.put_nowait((reply_text, dest_id, False))
-            except queue.Full:
-                with patch_stdout(raw=True):
-                    print(f"{C_BLUE}[{ts()}] Send queue full, dropping auto reply{C_RESET}")
+            except asyncio.QueueFull:
+                print(_FMT_QUEUE_FULL % (now_ts, "auto reply"))
     except Exception as e:
-        with patch_stdout(raw=True):
-            print(f"RX error: {e}")
+        print(f"RX error: {e}")
 
 class MeshtasticCompleter(Completer):
     def __init__(self, interface):
         self.interface = interface
 
     def get_completions(self, document, complete_event):
-        words = []
-        short_names = set()
-        nodes_snapshot = list(self.interface.nodes.items())
-        for nid, node in nodes_snapshot:
-            user = node.get("user", {})
-            short = user.get("shortName")
-            if short:
-                short_names.add(short)
-        with name_cache_lock:
-            for short in list(name_cache.values()):
-                if isinstance(short, str) and not short.startswith("!"):
-                    short_names.add(short)
-        words.extend(f"@{name}" for name in sorted(short_names))
         text_before_cursor = document.text_before_cursor
-        for word in words:
-            if word.startswith(text_before_cursor):
-                yield Completion(word, start_position=-len(text_before_cursor))
+        if text_before_cursor and not text_before_cursor.startswith("@"):
+            return
+        prefix = text_before_cursor[1:]
+        with name_cache_lock:
+            i = bisect.bisect_left(_sorted_names, prefix)
+            matches = []
+            while i < len(_sorted_names) and _sorted_names[i].startswith(prefix):
+                matches.append(_sorted_names[i])
+                i += 1
+        for name in matches:
+            yield Completion(f"@{name}", start_position=-len(text_before_cursor))
 
-def main():
-    try:
-        interface = SerialInterface()
-    except Exception as e:
-        print(f"Meshtastic device not found: {e}")
-        return
+async def input_loop(session, interface):
+    while True:
+        try:
+            raw_line = await session.prompt_async("")
+            line = raw_line.strip()
+            if not line:
+                continue
+            dest_id = None
+            text = line
+            if line.startswith("@"):
+                parts = line.split(maxsplit=1)
+                target = parts[0][1:]
+                text = parts[1] if len(parts) > 1 else ""
+                dest_id = resolve_node(interface, target)
+                if dest_id is None:
+                    print(_FMT_UNKNOWN_NODE % (ts(), target))
+                    continue
+            try:
+                send_queue.put_nowait((text, dest_id, True))
+            except asyncio.QueueFull:
+                print(_FMT_QUEUE_FULL % (ts(), "message"))
+        except EOFError:
+            pass
+        except KeyboardInterrupt:
+            break
+        except Exception as e:
+            print(f"Input error: {e}")
+            await asyncio.sleep(0.1)
+
+async def amain(interface):
+    global _loop, send_queue, _expiry_wake
+    send_queue = SendQueue(maxsize=30)
+    _expiry_wake = asyncio.Event()
+    _loop = asyncio.get_running_loop()
 
     history_file = os.path.expanduser("~/.meshtastic_history")
     history = FileHistory(history_file)
 
+    toolbar_cache = [None, "chars: 0, bytes: 0"]  # последний текст и готовая строка
+
     def get_bottom_toolbar():
         try:
             text = session.default_buffer.text
         except AttributeError:
             text = ""
+        if text is toolbar_cache[0]:
+            return toolbar_cache[1]
         char_count = len(text)
-        byte_count = len(text.encode('utf-8'))
-        return f"chars: {char_count}, bytes: {byte_count}"
+        if text.isascii():
+            byte_count = char_count
+        else:
+            # Длина в UTF-8 без создания bytes: 1-4 байта в зависимости от кодовой точки
+            byte_count = sum((1, 2, 3, 4)[(o > 0x7f) + (o > 0x7ff) + (o > 0xffff)] for o in map(ord, text))
+        toolbar_cache[0] = text
+        toolbar_cache[1] = f"chars: {char_count}, bytes: {byte_count}"
+        return toolbar_cache[1]
 
     session = PromptSession(
         history=history,
@@ -246,79 +395,39 @@ def main():
         bottom_toolbar=get_bottom_toolbar,
     )
 
-    def input_loop():
-        while not stop_event.is_set():
-            try:
-                with patch_stdout(raw=True):
-                    raw_line = session.prompt("")
-                line = raw_line.strip()
-                if not line:
-                    continue
-                dest_id = None
-                text = line
-                if line.startswith("@"):
-                    parts = line.split(maxsplit=1)
-                    target = parts[0][1:]
-                    text = parts[1] if len(parts) > 1 else ""
-                    dest_id = resolve_node(interface, target)
-                    if dest_id is None:
-                        with patch_stdout(raw=True):
-                            print(f"{C_BLUE}[{ts()}] Unknown node: {target}{C_RESET}")
-                        continue
-                try:
-                    send_queue.put_nowait((text, dest_id, True))
-                except queue.Full:
-                    with patch_stdout(raw=True):
-                        print(f"{C_BLUE}[{ts()}] Send queue full, dropping message{C_RESET}")
-            except EOFError:
-                pass
-            except KeyboardInterrupt:
-                stop_event.set()
-                break
-            except Exception as e:
-                with patch_stdout(raw=True):
-                    print(f"Input error: {e}")
-                time.sleep(0.1)
-
-    def ack_watcher():
-        while not stop_event.is_set():
-            time.sleep(1)
-            now = time.time()
-            expired = []
-            with pending_lock:
-                for rid, (t0, dest) in list(pending_acks.items()):
-                    if now - t0 > ACK_TIMEOUT:
-                        expired.append((rid, dest))
-                        pending_acks.pop(rid, None)
-            for rid, dest in expired:
-                dst = f"@!{dest:08x}" if dest else "@broadcast"
-                with patch_stdout(raw=True):
-                    print(f"{C_BLUE}[{ts()}] NO ACK from {dst}, id={rid}{C_RESET}")
-
-    sender = threading.Thread(
-        target=sender_thread,
-        args=(interface, stop_event, send_queue, pending_acks, pending_lock),
-        daemon=True
-    )
-    sender.start()
 
-    pub.subscribe(on_receive, "meshtastic.receive")
-    pub.subscribe(on_node_updated, "meshtastic.node.updated")
+    # Весь цикл работает под одним patch_stdout: задачи печатают без собственного входа в контекст
+    with patch_stdout(raw=True):
+        print(f"{C_BLUE}Meshtastic chat started. All lines sent immediately. Ctrl+C to exit.{C_RESET}")
+        print(f"{C_BLUE}Use Tab for auto-completion of node names.{C_RESET}")
+        print(f"{C_BLUE}Interactive char/byte counter shown at bottom.{C_RESET}")
+        tasks = [asyncio.create_task(sender_task(interface)), asyncio.create_task(ack_watcher())]
+        try:
+            await input_loop(session, interface)
+        finally:
+            _loop = None
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-    threading.Thread(target=input_loop, daemon=True).start()
-    threading.Thread(target=ack_watcher, daemon=True).start()
+def main():
+    try:
+        interface = SerialInterface()
+    except Exception as e:
+        print(f"Meshtastic device not found: {e}")
+        return
+
+    # Подписка до заполнения индекса, чтобы не потерять обновления в промежутке
+    pub.subscribe(on_node_updated, "meshtastic.node.updated")
+    pub.subscribe(on_receive, "meshtastic.receive")
+    for node in interface.nodes.copy().values():
+        index_node(node)
 
     try:
-        with patch_stdout(raw=True):
-            print(f"{C_BLUE}Meshtastic chat started. All lines sent immediately. Ctrl+C to exit.{C_RESET}")
-            print(f"{C_BLUE}Use Tab for auto-completion of node names.{C_RESET}")
-            print(f"{C_BLUE}Interactive char/byte counter shown at bottom.{C_RESET}")
-        while not stop_event.is_set():
-            time.sleep(0.1)
+        asyncio.run(amain(interface))
     except KeyboardInterrupt:
         pass
     finally:
-        stop_event.set()
         interface.close()
         with patch_stdout(raw=True):
             print(f"\n{C_BLUE}Stopped.{C_RESET}")